@@ -8,21 +8,228 @@ Implements the SLO gate logic as specified in Production_Checklist.md:
 """
 
 import argparse
+import hashlib
+import heapq
+import io
 import json
+import mmap
 import sys
-import statistics
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
-import requests
+from typing import Dict, List, Set, Tuple, Optional, Sequence
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote, urlencode
 import os
 import zipfile
 import tempfile
-import base64
+
+# Required: without an HTTP client the gate must fail loudly rather than treat
+# the GitHub history as empty
+import httpx
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python paths are used without it
+    np = None
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:  # orjson is optional; stdlib json accepts bytes as well
+    _loads = json.loads
+    
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+@lru_cache(maxsize=None)
+def _get_drift_kernel():
+    """Compile the Numba drift kernel on first use, or return None without Numba.
+    
+    Importing numba costs more than the rest of the script, and the kernel only
+    pays off on very wide metric sets, so it is never imported up front.
+    """
+    try:
+        import numba
+    except ImportError:  # Numba is optional; the NumPy path is used without it
+        return None
+    
+    # fastmath minus the no-NaN/no-Inf flags: NaN marks a metric missing from a sample
+    @numba.njit(cache=True, parallel=True, fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'})
+    def drift_kernel(current, history, threshold_percent):
+        """Drift % of each metric vs the median of its non-NaN history column"""
+        n_metrics = current.shape[0]
+        drift = np.full(n_metrics, np.nan)
+        violations = np.zeros(n_metrics, dtype=np.bool_)
+        for j in numba.prange(n_metrics):
+            column = history[:, j]
+            samples = column[~np.isnan(column)]
+            if samples.size == 0:
+                continue
+            median = np.median(samples)
+            if median > 0:
+                drift[j] = abs((current[j] - median) / median) * 100.0
+                violations[j] = drift[j] > threshold_percent
+        return violations, drift
+    
+    return drift_kernel
+
+def _partition_median(samples):
+    """Column medians of a NaN-free (samples x metrics) array via O(n) selection"""
+    n = samples.shape[0]
+    mid = n // 2
+    if n % 2:
+        return np.partition(samples, mid, axis=0)[mid]
+    partitioned = np.partition(samples, (mid - 1, mid), axis=0)
+    return (partitioned[mid - 1] + partitioned[mid]) / 2
+
+def _read_lines_reversed(path: str):
+    """Yield the non-empty lines of a file from last to first, slicing a read-only memory map"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # Empty files can't be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            while end > 0:
+                start = mm.rfind(b'\n', 0, end) + 1
+                if start < end:
+                    yield mm[start:end]
+                end = start - 1
+
+# GitHub rate-limit and transient gateway statuses worth retrying with backoff
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Sentinel for dict lookups where None is a legitimate stored value
+_MISSING = object()
+
+# Timestamp format used by the GitHub API, which also sorts lexicographically
+GITHUB_TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+REPORT_HEADER_TEMPLATE = """\
+# SLO Gate Report - {sku}
+
+**Platform:** {platform}
+**Timestamp:** {timestamp}Z
+**Gate Decision:** {decision}
+
+## Gate Analysis
+
+- **Critical Metrics:** {critical}
+- **Drift Check:** {drift}
+- **Consecutive Passes:** {consecutive}/{required}
+
+**Reason:** {reason}
+
+## Measured Metrics
+"""
+
+# Display unit for each unit marker in a metric name, in priority order
+METRIC_UNITS = (('_ms', 'ms'), ('_us', 'µs'), ('_w', 'W'))
+
+@lru_cache(maxsize=None)
+def _metric_unit(metric: str) -> str:
+    """Display unit of a metric, resolved once per metric name"""
+    for marker, unit in METRIC_UNITS:
+        if marker in metric:
+            return unit
+    return ''
+
+class GateCheckError(Exception):
+    """Raised when the gate cannot be evaluated, e.g. unreadable SLO results"""
+
+@dataclass
+class MetricMatrix:
+    """Structure-of-arrays view of many SLO results.
+    
+    One row per sample and one column per metric, so medians and drift are
+    column reductions instead of per-metric dict walks. Requires NumPy.
+    """
+    
+    cols: Dict[str, int]
+    data: 'np.ndarray'  # (n_samples, n_metrics); NaN where a sample lacks a metric
+    
+    @classmethod
+    def from_results(cls, results: List[Dict]) -> 'MetricMatrix':
+        """Stack the metrics of several SLO results into one matrix"""
+        cols = {}
+        for result in results:
+            for metric in result['metrics']:
+                cols.setdefault(metric, len(cols))
+        
+        data = np.full((len(results), len(cols)), np.nan)
+        for row, result in enumerate(results):
+            metrics = result['metrics']
+            indices = np.fromiter((cols[m] for m in metrics), dtype=np.intp, count=len(metrics))
+            data[row, indices] = np.fromiter(metrics.values(), dtype=np.float64, count=len(metrics))
+        return cls(cols, data)
+    
+    def columns(self, metrics: List[str]) -> 'np.ndarray':
+        """Sub-matrix holding only the given metrics, in that order"""
+        return self.data[:, [self.cols[m] for m in metrics]]
+
+class RunningMedian:
+    """Streaming median over samples fed in a single pass, in any order.
+    
+    Keeps the lower half in a max-heap and the upper half in a min-heap, so
+    push is O(log n) and median is O(1) without sorting a per-metric list.
+    """
+    
+    __slots__ = ('_low', '_high')
+    
+    def __init__(self):
+        self._low = []  # max-heap of negated values
+        self._high = []  # min-heap
+    
+    def __len__(self) -> int:
+        return len(self._low) + len(self._high)
+    
+    def push(self, value: float):
+        """Add a sample, keeping the lower half equal to or one larger than the upper half"""
+        if self._low and value > -self._low[0]:
+            heapq.heappush(self._high, value)
+            if len(self._high) > len(self._low):
+                heapq.heappush(self._low, -heapq.heappop(self._high))
+        else:
+            heapq.heappush(self._low, -value)
+            if len(self._low) > len(self._high) + 1:
+                heapq.heappush(self._high, -heapq.heappop(self._low))
+    
+    def median(self) -> float:
+        """Median of the samples pushed so far"""
+        if len(self._low) > len(self._high):
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2
 
 class SloGateChecker:
-    def __init__(self, github_token: str, repo: str):
+    __slots__ = (
+        'github_token', 'repo', 'workflow', 'branch', '_actions_api', '_workflow_runs_url', '_artifacts_url',
+        'headers', 'critical_metrics', '_critical_items', '_threshold_labels',
+        '_check_fn', 'drift_threshold_percent', 'jit_min_metrics',
+        'rolling_window_days', 'consecutive_passes_required', 'gate_history_file', 'gate_history_max_runs',
+        'streaming_parse_bytes', 'etag_cache_file', 'etag_body_dir', 'etag_cache_max_entries', 'history_cache_dir',
+        'history_cache_grace_days', 'artifact_cache_dir', 'artifact_cache_max_entries', 'max_workers',
+        'download_streams', 'min_range_bytes', 'max_retries', 'max_retry_wait', '_client', '_etag_cache', '_lock', '_history_lock', '_history_lines',
+    )
+    
+    def __init__(self, github_token: str, repo: str, workflow: str = 'slo-gates.yml',
+                 branch: Optional[str] = None):
         self.github_token = github_token
         self.repo = repo
+        self.workflow = workflow  # Workflow file name or ID that uploads the SLO artifacts
+        self.branch = branch  # Only compare against runs on this branch, if set
+        self._actions_api = f"https://api.github.com/repos/{repo}/actions"
+        self._workflow_runs_url = f"{self._actions_api}/workflows/{workflow}/runs"
+        self._artifacts_url = f"{self._actions_api}/artifacts"
         self.headers = {
             'Authorization': f'token {github_token}',
             'Accept': 'application/vnd.github.v3+json'
@@ -40,173 +247,586 @@ class SloGateChecker:
             'memory.tlb_shootdown_p99_us': 40.0,  # 40µs
         }
         
+        self._critical_items = tuple(self.critical_metrics.items())
+        self._check_fn = self._compile_critical_check()
+        # Report suffixes depend only on the static thresholds, so render them once
+        self._threshold_labels = {
+            metric: (threshold, f" (threshold: {threshold:.3f}{_metric_unit(metric)})")
+            for metric, threshold in self._critical_items
+        }
+        
         self.drift_threshold_percent = 5.0
+        self.jit_min_metrics = 256  # Below this the Numba kernel's dispatch cost isn't worth it
         self.rolling_window_days = 7
         self.consecutive_passes_required = 2
-        self.gate_history_file = '.slo_gate_history.json'
+        self.gate_history_file = '.slo_gate_history.jsonl'
+        self.gate_history_max_runs = 50  # Rotate the history log after this many runs
+        self.streaming_parse_bytes = 64 << 20  # Stream-parse result files larger than 64 MiB
+        self.etag_cache_file = '.slo_etag_cache.json'
+        self.etag_body_dir = '.slo_etag_cache'
+        self.etag_cache_max_entries = 500
+        self.history_cache_dir = os.path.join(os.environ.get('RUNNER_TEMP', tempfile.gettempdir()), 'slo_cache')
+        self.history_cache_grace_days = 1  # Runs around midnight or re-run later can still land in recent days
+        self.artifact_cache_dir = '.slo_artifact_cache'
+        self.artifact_cache_max_entries = 200
+        self.max_workers = min(8, (os.cpu_count() or 1) * 2)
+        self.download_streams = 4
+        self.min_range_bytes = 1 << 20  # Don't split downloads into ranges smaller than 1 MiB
+        self.max_retries = 4
+        self.max_retry_wait = 60.0  # Give up rather than wait longer than this for a rate limit to reset
+        
+        # HTTP client and ETag cache are created lazily so that runs which never
+        # touch the GitHub API don't open connections or read the cache
+        self._client = None
+        self._etag_cache = None
+        
+        # Several SKUs may be checked concurrently against one checker
+        self._lock = threading.Lock()
+        self._history_lock = threading.Lock()
+        self._history_lines = None
     
-    def _download_and_parse_artifact(self, download_url: str) -> Optional[Dict]:
-        """Download and parse SLO results from GitHub artifact"""
-        try:
-            # Download the artifact zip file
-            response = requests.get(download_url, headers=self.headers)
-            response.raise_for_status()
+    def close(self):
+        """Release the HTTP client's pooled connections"""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+    
+    def _get_client(self):
+        """Return the shared keep-alive HTTP client, creating it on first use"""
+        with self._lock:
+            if self._client is None:
+                try:
+                    import h2  # noqa: F401 - httpx only negotiates HTTP/2 with it installed
+                    http2 = True
+                except ImportError:
+                    http2 = False
+                
+                # One pool for the API and blob storage, sized for concurrent
+                # page/artifact fetches; over HTTP/2 API requests share a connection.
+                # The token is added per API request so it never reaches blob storage.
+                limits = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+                transport = httpx.HTTPTransport(http2=http2, retries=3, limits=limits)
+                self._client = httpx.Client(timeout=30, transport=transport)
+            return self._client
+    
+    def _retry_delay(self, response, attempt: int) -> float:
+        """Seconds to wait before retrying, honouring GitHub's rate-limit headers"""
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        reset = response.headers.get('X-RateLimit-Reset')
+        if response.headers.get('X-RateLimit-Remaining') == '0' and reset is not None:
+            return max(0.0, float(reset) - time.time())
+        return 0.2 * 2 ** attempt
+    
+    def _request(self, method: str, url: str, params: Optional[Dict] = None,
+                 headers: Optional[Dict] = None, authenticated: bool = True, follow_redirects: bool = True):
+        """Send a request on the shared client, retrying rate-limit and gateway errors with backoff"""
+        client = self._get_client()
+        if authenticated:
+            headers = {**self.headers, **(headers or {})}
+        
+        # httpx transports only retry failed connections, so retry statuses here
+        attempt = 0
+        while True:
+            response = client.request(method, url, params=params, headers=headers,
+                                      follow_redirects=follow_redirects)
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+            delay = self._retry_delay(response, attempt)
+            if delay > self.max_retry_wait:
+                return response  # Rate limit resets too far out to wait for
+            time.sleep(delay)
+            attempt += 1
+    
+    def _load_etag_cache(self) -> Dict:
+        """Load the URL -> (ETag, cached body path) index from previous invocations"""
+        with self._lock:
+            if self._etag_cache is None:
+                self._etag_cache = {}
+                try:
+                    if os.path.exists(self.etag_cache_file):
+                        with open(self.etag_cache_file, 'rb') as f:
+                            self._etag_cache = _loads(f.read())
+                except Exception as e:
+                    print(f"⚠️  Failed to load ETag cache: {e}")
+            return self._etag_cache
+    
+    def _save_etag_cache(self):
+        """Persist cached ETags so the next invocation can revalidate with 304s"""
+        with self._lock:
+            if not self._etag_cache:
+                return
             
-            # Create a temporary file to store the zip
-            with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                temp_file.write(response.content)
-                temp_file_path = temp_file.name
+            # Listing URLs carry a date filter, so new keys appear every day. Entries
+            # move to the end whenever they are used (dicts keep insertion order),
+            # so the front holds the least recently used ones to retire.
+            excess = len(self._etag_cache) - self.etag_cache_max_entries
+            for key in list(islice(self._etag_cache, max(excess, 0))):
+                try:
+                    os.unlink(self._etag_cache.pop(key)['body_path'])
+                except OSError:
+                    pass
             
             try:
-                # Extract and parse the JSON file from the zip
-                with zipfile.ZipFile(temp_file_path, 'r') as zip_file:
-                    # Look for JSON files in the zip
-                    json_files = [f for f in zip_file.namelist() if f.endswith('.json')]
-                    
-                    if not json_files:
-                        return None
-                    
-                    # Read the first JSON file (should be slo_results.json)
-                    with zip_file.open(json_files[0]) as json_file:
-                        content = json_file.read().decode('utf-8')
-                        return json.loads(content)
-            finally:
-                # Clean up temporary file
-                os.unlink(temp_file_path)
+                with open(self.etag_cache_file, 'wb') as f:
+                    f.write(_dumps(self._etag_cache))
+            except Exception as e:
+                print(f"⚠️  Failed to save ETag cache: {e}")
+    
+    def _cached_get(self, url: str, params: Optional[Dict] = None) -> Dict:
+        """GET a GitHub API document, revalidating against the cached ETag if we have one"""
+        cache = self._load_etag_cache()
+        key = f"{url}?{urlencode(sorted((params or {}).items()))}"
+        cached = cache.get(key)
+        headers = {'If-None-Match': cached['etag']} if cached else None
+        
+        # 304s carry no body and don't count against the primary rate limit
+        response = self._request('GET', url, params, headers)
+        if response.status_code == 304 and cached:
+            try:
+                with open(cached['body_path'], 'rb') as f:
+                    body = _loads(f.read())
+                with self._lock:
+                    cache[key] = cache.pop(key, cached)  # Mark as recently used
+                return body
+            except Exception as e:
+                print(f"⚠️  Cached body for {url} is unreadable, refetching: {e}")
+                response = self._request('GET', url, params)
+        response.raise_for_status()
+        
+        body = response.json()
+        etag = response.headers.get('ETag')
+        if etag:
+            body_path = os.path.join(self.etag_body_dir, f"{hashlib.sha1(key.encode()).hexdigest()}.json")
+            try:
+                os.makedirs(self.etag_body_dir, exist_ok=True)
+                tmp_path = f"{body_path}.tmp.{os.getpid()}.{threading.get_ident()}"
+                with open(tmp_path, 'wb') as f:
+                    f.write(response.content)
+                os.replace(tmp_path, body_path)
+                with self._lock:
+                    cache.pop(key, None)  # Re-insert at the end as most recently used
+                    cache[key] = {'etag': etag, 'body_path': body_path}
+            except Exception as e:
+                print(f"⚠️  Failed to cache response body for {url}: {e}")
+        return body
+    
+    def _with_branch(self, params: Dict) -> Dict:
+        """Add the server-side branch filter to run-listing parameters when a branch is set"""
+        if self.branch:
+            return {**params, 'branch': self.branch}
+        return params
+    
+    def _get_all_pages(self, url: str, params: Dict, key: str) -> List[Dict]:
+        """Fetch every page of a list endpoint, requesting pages 2..N concurrently"""
+        per_page = params.get('per_page', 100)
+        first = self._cached_get(url, {**params, 'page': 1})
+        items = list(first[key])
+        
+        total_pages = -(-first.get('total_count', len(items)) // per_page)
+        if total_pages > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pages = executor.map(lambda page: self._cached_get(url, {**params, 'page': page}),
+                                     range(2, total_pages + 1))
+                for page in pages:
+                    items.extend(page[key])
+        return items
+    
+    def _download_artifact(self, url: str, size: int) -> bytes:
+        """Download an artifact into memory, splitting large ones into parallel HTTP Range requests"""
+        nstreams = max(1, min(self.download_streams, size // self.min_range_bytes))
+        if nstreams == 1:
+            # Typical small artifact: one GET, letting the client follow the redirect
+            # to blob storage (httpx drops the token on the cross-origin hop)
+            response = self._request('GET', url)
+            response.raise_for_status()
+            return response.content
+        
+        # The API answers with a redirect to blob storage, which serves byte ranges;
+        # the GitHub token must not be forwarded there
+        response = self._request('GET', url, follow_redirects=False)
+        if not response.is_redirect:
+            response.raise_for_status()
+            return response.content  # Served directly, already in full
+        blob_url = response.headers['Location']
+        
+        head = self._request('HEAD', blob_url, authenticated=False)
+        head.raise_for_status()
+        size = int(head.headers.get('Content-Length', 0))
+        if head.headers.get('Accept-Ranges') == 'bytes':
+            nstreams = max(1, min(nstreams, size // self.min_range_bytes))
+        else:
+            nstreams = 1
+        
+        if nstreams == 1:
+            response = self._request('GET', blob_url, authenticated=False)
+            response.raise_for_status()
+            return response.content
+        
+        # Pre-size the buffer so each stream can fill its own slice without locking
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        chunk_size = -(-size // nstreams)
+        
+        def fetch_range(lo: int):
+            hi = min(lo + chunk_size, size) - 1
+            part = self._request('GET', blob_url, headers={'Range': f'bytes={lo}-{hi}'}, authenticated=False)
+            part.raise_for_status()
+            if part.status_code != 206:
+                raise IOError(f"Range request for bytes {lo}-{hi} was not honoured")
+            if len(part.content) != hi + 1 - lo:
+                raise IOError(f"Short read for bytes {lo}-{hi}")
+            view[lo:hi + 1] = part.content
+        
+        with ThreadPoolExecutor(max_workers=nstreams) as executor:
+            list(executor.map(fetch_range, range(0, size, chunk_size)))
+        return buffer
+    
+    def _download_and_parse_artifact(self, download_url: str, size: int = 0) -> Optional[Dict]:
+        """Download and parse SLO results from GitHub artifact"""
+        try:
+            # Download the artifact zip file and open it in memory
+            data = self._download_artifact(download_url, size)
+            
+            with zipfile.ZipFile(io.BytesIO(data), 'r') as zip_file:
+                # Pick the SLO results entry from the central directory, falling back
+                # to the first JSON file, and decompress only that entry
+                json_entries = [info for info in zip_file.infolist()
+                                if not info.is_dir() and info.filename.endswith('.json')]
+                if not json_entries:
+                    return None
+                
+                entry = next((info for info in json_entries
+                              if os.path.basename(info.filename).startswith('slo_results')), json_entries[0])
+                return _loads(zip_file.read(entry))
                 
         except Exception as e:
             print(f"⚠️  Error downloading/parsing artifact: {e}")
             return None
     
-    def _load_local_gate_history(self) -> Dict:
-        """Load local gate history from file"""
+    def _get_artifact_results(self, artifact: Dict) -> Optional[Dict]:
+        """Return the parsed SLO results of an artifact, downloading it only on a cache miss"""
+        # Artifacts are immutable once their run completes, so the ID is a stable key
+        path = os.path.join(self.artifact_cache_dir, f"{artifact['id']}.json")
         try:
-            if os.path.exists(self.gate_history_file):
-                with open(self.gate_history_file, 'r') as f:
-                    return json.load(f)
+            with open(path, 'rb') as f:
+                slo_data = _loads(f.read())
+            os.utime(path)  # Mark as recently used for eviction
+            return slo_data
+        except FileNotFoundError:
+            pass
         except Exception as e:
-            print(f"⚠️  Failed to load gate history: {e}")
-        return {'runs': []}
+            print(f"⚠️  Ignoring unreadable artifact cache {path}: {e}")
+        
+        slo_data = self._download_and_parse_artifact(artifact['archive_download_url'],
+                                                     artifact.get('size_in_bytes', 0))
+        if slo_data:
+            try:
+                os.makedirs(self.artifact_cache_dir, exist_ok=True)
+                tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+                with open(tmp_path, 'wb') as f:
+                    f.write(_dumps(slo_data))
+                os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"⚠️  Failed to write artifact cache {path}: {e}")
+        return slo_data
     
-    def _save_local_gate_history(self, history: Dict):
-        """Save local gate history to file"""
+    def _evict_artifact_cache(self):
+        """Drop the least recently used cached artifacts beyond the size cap"""
         try:
-            with open(self.gate_history_file, 'w') as f:
-                json.dump(history, f, indent=2)
-        except Exception as e:
-            print(f"⚠️  Failed to save gate history: {e}")
+            entries = [entry for entry in os.scandir(self.artifact_cache_dir) if entry.name.endswith('.json')]
+        except FileNotFoundError:
+            return
+        
+        excess = len(entries) - self.artifact_cache_max_entries
+        if excess > 0:
+            entries.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in entries[:excess]:
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+    
+    def _iter_gate_history(self):
+        """Yield recorded gate results newest first, continuing into the rotated log"""
+        for path in (self.gate_history_file, f"{self.gate_history_file}.1"):
+            try:
+                for line in _read_lines_reversed(path):
+                    try:
+                        yield _loads(line)
+                    except ValueError:
+                        continue  # Torn write from an interrupted run
+            except FileNotFoundError:
+                continue
     
-    def _record_gate_result(self, sku: str, sha: str, gate_passed: bool, results: Dict):
+    def _record_gate_result(self, sku: str, sha: str, gate_passed: bool, results: Dict, timestamp: str):
         """Record gate result in local history"""
-        history = self._load_local_gate_history()
-        
-        # Add new result
+        with self._history_lock:
+            self._record_gate_result_locked(sku, sha, gate_passed, results, timestamp)
+    
+    def _record_gate_result_locked(self, sku: str, sha: str, gate_passed: bool, results: Dict, timestamp: str):
+        """Append a gate result to the history file; caller holds the history lock"""
         new_result = {
-            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'timestamp': timestamp + 'Z',
             'sku': sku,
             'sha': sha,
             'gate_passed': gate_passed,
             'metrics': results['metrics'].copy()
         }
         
-        history['runs'].append(new_result)
-        
-        # Keep only last 50 runs to prevent file from growing too large
-        if len(history['runs']) > 50:
-            history['runs'] = history['runs'][-50:]
-        
-        self._save_local_gate_history(history)
+        try:
+            separator = b''
+            if self._history_lines is None:
+                try:
+                    with open(self.gate_history_file, 'rb') as f:
+                        content = f.read()
+                    self._history_lines = content.count(b'\n')
+                    # An interrupted run may have left a torn last line; terminate it
+                    # so the new record starts on a line of its own
+                    if content and not content.endswith(b'\n'):
+                        separator = b'\n'
+                        self._history_lines += 1
+                except FileNotFoundError:
+                    self._history_lines = 0
+            
+            # Rotate instead of truncating so the log is only ever appended to
+            if self._history_lines >= self.gate_history_max_runs:
+                os.replace(self.gate_history_file, f"{self.gate_history_file}.1")
+                self._history_lines = 0
+                separator = b''
+            
+            with open(self.gate_history_file, 'ab') as f:
+                f.write(separator + _dumps(new_result) + b'\n')
+            self._history_lines += 1
+        except Exception as e:
+            print(f"⚠️  Failed to save gate history: {e}")
     
     def load_slo_results(self, file_path: str) -> Dict:
         """Load SLO results from JSON file"""
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            with open(file_path, 'rb') as f:
+                if ijson is not None and os.fstat(f.fileno()).st_size > self.streaming_parse_bytes:
+                    results = self._stream_slo_results(f)
+                else:
+                    results = _loads(f.read())
         except Exception as e:
-            print(f"❌ Failed to load SLO results: {e}")
-            sys.exit(1)
+            raise GateCheckError(f"Failed to load SLO results: {e}") from e
+        
+        if not isinstance(results, dict) or 'platform' not in results or not isinstance(results.get('metrics'), dict):
+            raise GateCheckError(f"Invalid SLO results in {file_path}: expected 'platform' and a 'metrics' object")
+        return results
+    
+    def _history_cache_path(self, sku: str, day: str) -> str:
+        """Path of the cached historical results for one SKU and UTC day"""
+        # With NumPy, days are stored as compressed float32 arrays instead of JSON
+        extension = 'npz' if np is not None else 'json'
+        # Keyed by the same workflow and branch filters the runs were listed with,
+        # so history from one branch is never reused for another
+        scope = os.path.join(quote(str(self.workflow), safe=''), quote(self.branch, safe='') if self.branch else '_all')
+        return os.path.join(self.history_cache_dir, scope, sku, f"{day}.{extension}")
+    
+    def _load_cached_day(self, sku: str, day: str) -> Optional[List[Dict]]:
+        """Load cached historical results for a completed day, None on a cache miss"""
+        path = self._history_cache_path(sku, day)
+        try:
+            if np is None:
+                with open(path, 'rb') as f:
+                    return _loads(f.read())
+            
+            with np.load(path) as cached:
+                # NaN (value != value) marks a metric the sample didn't report
+                names = cached['names'].tolist()
+                return [
+                    {
+                        'platform': platform,
+                        'metrics': {name: value for name, value in zip(names, row) if value == value},
+                        'timestamp': timestamp,
+                        'run_id': run_id,
+                    }
+                    for platform, timestamp, run_id, row in zip(
+                        cached['platforms'].tolist(), cached['timestamps'].tolist(),
+                        cached['run_ids'].tolist(), cached['values'].tolist()
+                    )
+                ]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable history cache {path}: {e}")
+            return None
+    
+    def _save_cached_day(self, sku: str, day: str, results: List[Dict]):
+        """Atomically write the historical results of a completed day to the cache"""
+        path = self._history_cache_path(sku, day)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp.{os.getpid()}"
+            if np is None:
+                with open(tmp_path, 'wb') as f:
+                    f.write(_dumps(results))
+            else:
+                # float32 keeps ~7 significant digits, far finer than the 5% drift
+                # threshold, at half the size of float64
+                matrix = MetricMatrix.from_results(results)
+                with open(tmp_path, 'wb') as f:
+                    np.savez_compressed(
+                        f,
+                        names=np.array(list(matrix.cols), dtype=str),
+                        values=matrix.data.astype(np.float32),
+                        platforms=np.array([r.get('platform', '') for r in results], dtype=str),
+                        timestamps=np.array([r['timestamp'] for r in results], dtype=str),
+                        run_ids=np.array([r['run_id'] for r in results], dtype=np.int64),
+                    )
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️  Failed to write history cache {path}: {e}")
+    
+    def _fetch_historical_results(self, sku: str, start_date: datetime) -> Tuple[List[Dict], Set[str]]:
+        """Fetch SLO results of successful runs created since start_date from GitHub.
+        
+        Also returns the UTC days for which an artifact could not be downloaded,
+        so that those incomplete days are not cached.
+        """
+        # Only successful runs of the SLO workflow in the window; filtering
+        # server-side avoids walking every run in the repository
+        workflow_runs = self._get_all_pages(self._workflow_runs_url, self._with_branch({
+            'status': 'success',
+            'created': f'>={start_date.strftime(GITHUB_TIME_FORMAT)}',
+            'per_page': 100
+        }), 'workflow_runs')
+        runs_by_id = {run['id']: run for run in workflow_runs}
+        
+        # One name-filtered artifact listing replaces a metadata request per run
+        artifacts = self._get_all_pages(self._artifacts_url, {
+            'name': f'slo-results-{sku}',
+            'per_page': 100
+        }, 'artifacts')
+        slo_artifacts = [
+            artifact for artifact in artifacts
+            if not artifact.get('expired') and artifact['workflow_run']['id'] in runs_by_id
+        ]
+        
+        # Download and parse the artifacts concurrently over the shared session,
+        # collecting each one as soon as it lands (callers don't rely on order)
+        historical_results = []
+        incomplete_days = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._get_artifact_results, artifact): artifact
+                       for artifact in slo_artifacts}
+            for future in as_completed(futures):
+                run = runs_by_id[futures[future]['workflow_run']['id']]
+                slo_data = future.result()
+                if not slo_data:
+                    incomplete_days.add(run['created_at'][:10])
+                    continue
+                slo_data['timestamp'] = run['created_at']
+                slo_data['run_id'] = run['id']
+                historical_results.append(slo_data)
+        
+        self._save_etag_cache()
+        self._evict_artifact_cache()
+        return historical_results, incomplete_days
+    
+    def _stream_slo_results(self, f) -> Dict:
+        """Stream only the platform and metrics out of a large SLO results file"""
+        results = {'metrics': {}}
+        metric = None
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == 'platform' and event == 'string':
+                results['platform'] = value
+            elif prefix == 'metrics' and event == 'map_key':
+                metric = value
+            elif event == 'number' and metric is not None and prefix == f'metrics.{metric}':
+                results['metrics'][metric] = value
+        return results
     
     def get_historical_results(self, sku: str, days: int = 7) -> List[Dict]:
-        """Fetch historical SLO results from GitHub artifacts"""
+        """Fetch historical SLO results, reusing cached days and only querying GitHub for the delta"""
         print(f"📊 Fetching historical SLO data for {sku} (last {days} days)...")
         
+        # Calculate date range
+        end_date = datetime.utcnow()
+        start_date = end_date - timedelta(days=days)
+        today = end_date.strftime('%Y-%m-%d')
+        past_days = [(start_date + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(days)]
+        
+        # Days past the grace period no longer change, so only days missing from
+        # the cache plus the recent ones need to come from the API
+        historical_results = []
+        missing_days = []
+        for day in past_days:
+            cached = self._load_cached_day(sku, day)
+            if cached is None:
+                missing_days.append(day)
+            else:
+                historical_results.extend(cached)
+        
+        fetch_from = datetime.strptime(min(missing_days, default=today), '%Y-%m-%d')
         try:
-            # Calculate date range
-            end_date = datetime.utcnow()
-            start_date = end_date - timedelta(days=days)
-            
-            # List workflow runs from the specified date range
-            url = f"https://api.github.com/repos/{self.repo}/actions/runs"
-            params = {
-                'status': 'completed',
-                'created': f'{start_date.isoformat()}..{end_date.isoformat()}',
-                'per_page': 100
-            }
-            
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            
-            workflow_runs = response.json()['workflow_runs']
-            historical_results = []
-            
-            for run in workflow_runs:
-                # Skip failed runs
-                if run['conclusion'] != 'success':
-                    continue
-                    
-                # Get artifacts for this run
-                artifacts_url = f"https://api.github.com/repos/{self.repo}/actions/runs/{run['id']}/artifacts"
-                artifacts_response = requests.get(artifacts_url, headers=self.headers)
-                
-                if artifacts_response.status_code != 200:
-                    continue
-                    
-                artifacts = artifacts_response.json()['artifacts']
-                
-                # Look for SLO results artifact
-                slo_artifact = None
-                for artifact in artifacts:
-                    if 'slo-results' in artifact['name'].lower() and sku.lower() in artifact['name'].lower():
-                        slo_artifact = artifact
-                        break
-                
-                if not slo_artifact:
-                    continue
-                    
-                # Download and parse the artifact
-                try:
-                    slo_data = self._download_and_parse_artifact(slo_artifact['archive_download_url'])
-                    if slo_data:
-                        slo_data['timestamp'] = run['created_at']
-                        slo_data['run_id'] = run['id']
-                        historical_results.append(slo_data)
-                except Exception as e:
-                    print(f"⚠️  Failed to download artifact {slo_artifact['name']}: {e}")
-                    continue
-            
-            print(f"📈 Found {len(historical_results)} historical SLO results")
-            return historical_results
-            
+            fetched, incomplete_days = self._fetch_historical_results(sku, fetch_from)
         except Exception as e:
             print(f"⚠️  Failed to fetch historical data: {e}")
-            return []
-    
-    def check_critical_metrics(self, results: Dict) -> Tuple[bool, List[str]]:
-        """Check if all critical metrics meet their thresholds"""
-        failures = []
+            fetched = None
         
-        for metric, threshold in self.critical_metrics.items():
-            if metric not in results['metrics']:
-                failures.append(f"Missing critical metric: {metric}")
-                continue
+        if fetched is not None:
+            fetched_by_day = {day: [] for day in missing_days + [today]}
+            for result in fetched:
+                day = result['timestamp'][:10]
+                if day in fetched_by_day:
+                    fetched_by_day[day].append(result)
             
-            value = results['metrics'][metric]
-            if value > threshold:
-                failures.append(
-                    f"SLO violation: {metric} = {value:.3f}µs > {threshold:.3f}µs"
-                )
+            # Only cache settled days whose artifacts all downloaded; anything
+            # else is fetched again next time rather than frozen incomplete
+            settled_before = (end_date - timedelta(days=self.history_cache_grace_days)).strftime('%Y-%m-%d')
+            for day, results in fetched_by_day.items():
+                if day < settled_before and day not in incomplete_days:
+                    self._save_cached_day(sku, day, results)
+                historical_results.extend(results)
         
-        return len(failures) == 0, failures
+        cutoff = start_date.strftime(GITHUB_TIME_FORMAT)
+        historical_results = [r for r in historical_results if r['timestamp'] >= cutoff]
+        
+        print(f"📈 Found {len(historical_results)} historical SLO results")
+        return historical_results
+    
+    def _compile_critical_check(self):
+        """Generate a straight-line critical-metrics check with the thresholds inlined as constants"""
+        # Fast path: one short-circuiting comparison chain that allocates nothing.
+        # Missing metrics default to +inf so they fall through to the slow path.
+        conditions = [f"get({metric!r}, _INF) <= {float(threshold)!r}" for metric, threshold in self._critical_items]
+        lines = [
+            "def check_critical_metrics(metrics):",
+            "    get = metrics.get",
+            f"    if {' and '.join(conditions) or 'True'}:",
+            "        return _ALL_PASS",
+            "    return collect_failures(metrics)",
+            "",
+            "def collect_failures(metrics):",
+            "    failures = []",
+        ]
+        for metric, threshold in self._critical_items:
+            missing = f"Missing critical metric: {metric}"
+            violation = f"SLO violation: {metric.replace('%', '%%')} = %.3fµs > {threshold:.3f}µs"
+            lines += [
+                f"    value = metrics.get({metric!r}, _MISSING)",
+                "    if value is _MISSING:",
+                f"        failures.append({missing!r})",
+                f"    elif value > {float(threshold)!r}:",
+                f"        failures.append({violation!r} % value)",
+            ]
+        lines.append("    return len(failures) == 0, failures")
+        
+        namespace = {'_MISSING': _MISSING, '_INF': float('inf'), '_ALL_PASS': (True, ())}
+        exec(compile("\n".join(lines), '<critical-metrics-check>', 'exec'), namespace)
+        return namespace['check_critical_metrics']
+    
+    def check_critical_metrics(self, results: Dict) -> Tuple[bool, Sequence[str]]:
+        """Check if all critical metrics meet their thresholds"""
+        return self._check_fn(results['metrics'])
     
     def calculate_drift(self, current_results: Dict, historical_results: List[Dict]) -> Tuple[bool, Dict[str, float]]:
         """Calculate drift vs rolling 7-day median"""
@@ -214,39 +834,77 @@ class SloGateChecker:
             print("⚠️  No historical data available, skipping drift analysis")
             return True, {}
         
+        cutoff = (datetime.utcnow() - timedelta(days=self.rolling_window_days)).strftime(GITHUB_TIME_FORMAT)
+        if np is not None:
+            return self._calculate_drift_vectorized(current_results, historical_results, cutoff)
+        
         drift_violations = {}
         
-        # Calculate median for each metric over the historical period
-        historical_metrics = {}
+        # Stream in-window samples straight into a running median per metric;
+        # order doesn't matter, so there is nothing to sort or evict
+        historical_metrics = defaultdict(RunningMedian)
         for result in historical_results:
+            if result.get('timestamp', '') < cutoff:
+                continue
             for metric, value in result['metrics'].items():
-                if metric not in historical_metrics:
-                    historical_metrics[metric] = []
-                historical_metrics[metric].append(value)
+                historical_metrics[metric].push(value)
         
         # Check drift for each current metric
+        drift_threshold = self.drift_threshold_percent
         for metric, current_value in current_results['metrics'].items():
-            if metric in historical_metrics and len(historical_metrics[metric]) > 0:
-                median_value = statistics.median(historical_metrics[metric])
+            window = historical_metrics.get(metric)
+            if window:
+                median_value = window.median()
                 
                 if median_value > 0:  # Avoid division by zero
                     drift_percent = abs((current_value - median_value) / median_value) * 100
                     
-                    if drift_percent > self.drift_threshold_percent:
+                    if drift_percent > drift_threshold:
                         drift_violations[metric] = drift_percent
         
         return len(drift_violations) == 0, drift_violations
     
+    def _calculate_drift_vectorized(self, current_results: Dict, historical_results: List[Dict],
+                                    cutoff: str) -> Tuple[bool, Dict[str, float]]:
+        """Calculate drift with NumPy over a (samples x metrics) matrix of the window"""
+        window = [r for r in historical_results if r.get('timestamp', '') >= cutoff]
+        history = MetricMatrix.from_results(window)
+        
+        current = current_results['metrics']
+        names = [m for m in current if m in history.cols]
+        if not names:
+            return True, {}
+        
+        samples = history.columns(names)
+        values = np.fromiter((current[m] for m in names), dtype=np.float64, count=len(names))
+        
+        drift_kernel = _get_drift_kernel() if len(names) >= self.jit_min_metrics else None
+        if drift_kernel is not None:
+            violations_mask, drift = drift_kernel(values, samples, self.drift_threshold_percent)
+        else:
+            if np.isnan(samples).any():
+                medians = np.nanmedian(samples, axis=0)
+            else:
+                medians = _partition_median(samples)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                drift = np.abs((values - medians) / medians) * 100.0
+            
+            # Non-positive medians are skipped to avoid division by zero
+            violations_mask = (medians > 0) & (drift > self.drift_threshold_percent)
+        drift_violations = {names[i]: float(drift[i]) for i in np.flatnonzero(violations_mask)}
+        return len(drift_violations) == 0, drift_violations
+    
     def check_consecutive_passes(self, sku: str) -> Tuple[bool, int]:
-        """Check if we have consecutive passes using GitHub API and local history"""
+        """Check if we have consecutive passes using local history and GitHub API"""
         print(f"📈 Checking consecutive passes for {sku}...")
         
-        # Try GitHub API first
-        consecutive_passes = self._check_consecutive_passes_github(sku)
+        # Local history costs no API calls, so try it first
+        consecutive_passes = self._check_consecutive_passes_local(sku)
         
-        # If GitHub API fails or returns 0, try local history as fallback
-        if consecutive_passes == 0:
-            consecutive_passes = self._check_consecutive_passes_local(sku)
+        # Only ask GitHub when local history can't open the gate on its own,
+        # keeping the local count if the API fails or returns 0
+        if consecutive_passes < self.consecutive_passes_required:
+            consecutive_passes = self._check_consecutive_passes_github(sku) or consecutive_passes
             
         print(f"📊 Found {consecutive_passes} consecutive passes")
         return consecutive_passes >= self.consecutive_passes_required, consecutive_passes
@@ -254,43 +912,27 @@ class SloGateChecker:
     def _check_consecutive_passes_github(self, sku: str) -> int:
         """Check consecutive passes using GitHub API"""
         try:
-            # Get recent workflow runs (last 20 to check for consecutive passes)
-            url = f"https://api.github.com/repos/{self.repo}/actions/runs"
-            params = {
+            # Only the newest `consecutive_passes_required` runs can affect the
+            # outcome. Keep failed runs in the listing (status=completed rather
+            # than status=success) so they still break the streak.
+            url = self._workflow_runs_url
+            params = self._with_branch({
                 'status': 'completed',
-                'per_page': 20
-            }
+                'per_page': self.consecutive_passes_required
+            })
             
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
+            workflow_runs = self._cached_get(url, params)['workflow_runs']
+            self._save_etag_cache()
             
-            workflow_runs = response.json()['workflow_runs']
+            # Every matrix job uploads its SLO results before the run can succeed,
+            # so a successful run of this workflow is enough without checking artifacts
             consecutive_passes = 0
-            
             for run in workflow_runs:
-                # Check if this run had SLO tests
-                if 'slo' not in run['name'].lower():
-                    continue
-                    
-                # Check if the run passed (successful conclusion)
-                if run['conclusion'] == 'success':
-                    # Verify it actually had SLO results by checking for artifacts
-                    artifacts_url = f"https://api.github.com/repos/{self.repo}/actions/runs/{run['id']}/artifacts"
-                    artifacts_response = requests.get(artifacts_url, headers=self.headers)
-                    
-                    if artifacts_response.status_code == 200:
-                        artifacts = artifacts_response.json()['artifacts']
-                        has_slo_results = any('slo-results' in artifact['name'].lower() and sku.lower() in artifact['name'].lower() 
-                                            for artifact in artifacts)
-                        
-                        if has_slo_results:
-                            consecutive_passes += 1
-                        else:
-                            break  # No SLO results, stop counting
-                    else:
-                        break  # Can't verify, stop counting
-                else:
+                if run['conclusion'] != 'success':
                     break  # Failed run, reset consecutive count
+                consecutive_passes += 1
+                if consecutive_passes >= self.consecutive_passes_required:
+                    break
             
             return consecutive_passes
             
@@ -301,18 +943,17 @@ class SloGateChecker:
     def _check_consecutive_passes_local(self, sku: str) -> int:
         """Check consecutive passes using local history as fallback"""
         try:
-            history = self._load_local_gate_history()
-            
-            # Filter runs for this SKU and sort by timestamp (newest first)
-            sku_runs = [run for run in history['runs'] if run.get('sku') == sku]
-            sku_runs.sort(key=lambda x: x['timestamp'], reverse=True)
-            
+            # The log is appended in order, so reading it backwards visits the
+            # newest runs first and can stop as soon as the outcome is known
             consecutive_passes = 0
-            for run in sku_runs:
-                if run.get('gate_passed', False):
-                    consecutive_passes += 1
-                else:
+            for run in self._iter_gate_history():
+                if run.get('sku') != sku:
+                    continue
+                if not run.get('gate_passed', False):
                     break  # Failed run, stop counting
+                consecutive_passes += 1
+                if consecutive_passes >= self.consecutive_passes_required:
+                    break
             
             return consecutive_passes
             
@@ -323,6 +964,8 @@ class SloGateChecker:
     def should_pass_gate(self, results: Dict, sku: str) -> Tuple[bool, str, Dict]:
         """Determine if SLO gate should pass"""
         gate_info = {
+            # Taken once so the history record and the report agree on when the gate ran
+            'timestamp': datetime.utcnow().isoformat(),
             'critical_metrics_pass': False,
             'drift_check_pass': False,
             'consecutive_passes': 0,
@@ -339,17 +982,20 @@ class SloGateChecker:
             gate_info['reason'] = f"Critical metrics failed: {'; '.join(critical_failures)}"
             return False, gate_info['reason'], gate_info
         
-        # Get historical data for drift analysis
-        historical_results = self.get_historical_results(sku, self.rolling_window_days)
-        
-        # Check drift
-        drift_pass, drift_violations = self.calculate_drift(results, historical_results)
-        gate_info['drift_check_pass'] = drift_pass
-        
-        # Check consecutive passes
+        # Check consecutive passes first: either path opens the gate, and this one
+        # needs at most one API call (none when local history suffices), while
+        # drift analysis pulls the historical artifacts
         consecutive_pass, consecutive_count = self.check_consecutive_passes(sku)
         gate_info['consecutive_passes'] = consecutive_count
         
+        if consecutive_pass:
+            # Drift can't change the decision, so skip the historical fetch
+            drift_pass, drift_violations = None, {}
+        else:
+            historical_results = self.get_historical_results(sku, self.rolling_window_days)
+            drift_pass, drift_violations = self.calculate_drift(results, historical_results)
+        gate_info['drift_check_pass'] = drift_pass
+        
         # Gate decision logic: critical metrics AND (drift OR consecutive passes)
         if critical_pass and (drift_pass or consecutive_count >= self.consecutive_passes_required):
             gate_info['gate_decision'] = True
@@ -370,121 +1016,136 @@ class SloGateChecker:
             gate_info['reason'] = f"❌ Gate FAIL: {'; '.join(reasons)}"
             return False, gate_info['reason'], gate_info
     
+    def _format_metric_line(self, metric: str, value: float) -> str:
+        """Format one metric of the report, with its threshold if it is critical"""
+        unit = _metric_unit(metric)
+        
+        critical = self._threshold_labels.get(metric)
+        if critical is None:
+            return f"- ✅ **{metric}:** {value:.3f}{unit}"
+        
+        threshold, label = critical
+        status = "❌" if value > threshold else "✅"
+        return f"- {status} **{metric}:** {value:.3f}{unit}{label}"
+    
     def generate_report(self, results: Dict, gate_info: Dict, sku: str) -> str:
         """Generate detailed SLO gate report"""
-        report = []
-        report.append(f"# SLO Gate Report - {sku}")
-        report.append(f"")
-        report.append(f"**Platform:** {results['platform']}")
-        report.append(f"**Timestamp:** {datetime.utcnow().isoformat()}Z")
-        report.append(f"**Gate Decision:** {'✅ PASS' if gate_info['gate_decision'] else '❌ FAIL'}")
-        report.append(f"")
-        report.append(f"## Gate Analysis")
-        report.append(f"")
-        report.append(f"- **Critical Metrics:** {'✅ PASS' if gate_info['critical_metrics_pass'] else '❌ FAIL'}")
-        report.append(f"- **Drift Check:** {'✅ PASS' if gate_info['drift_check_pass'] else '❌ FAIL'}")
-        report.append(f"- **Consecutive Passes:** {gate_info['consecutive_passes']}/{self.consecutive_passes_required}")
-        report.append(f"")
-        report.append(f"**Reason:** {gate_info['reason']}")
-        report.append(f"")
-        report.append(f"## Measured Metrics")
-        report.append(f"")
-        
-        for metric, value in results['metrics'].items():
-            status = "✅"
-            threshold_info = ""
-            
-            if metric in self.critical_metrics:
-                threshold = self.critical_metrics[metric]
-                if value > threshold:
-                    status = "❌"
-                
-                # Format units based on metric name
-                if '_ms' in metric:
-                    unit = 'ms'
-                    threshold_info = f" (threshold: {threshold:.3f}ms)"
-                    value_str = f"{value:.3f}ms"
-                elif '_us' in metric:
-                    unit = 'µs'
-                    threshold_info = f" (threshold: {threshold:.3f}µs)"
-                    value_str = f"{value:.3f}µs"
-                elif '_w' in metric:
-                    unit = 'W'
-                    threshold_info = f" (threshold: {threshold:.3f}W)"
-                    value_str = f"{value:.3f}W"
-                else:
-                    unit = ''
-                    threshold_info = f" (threshold: {threshold:.3f})"
-                    value_str = f"{value:.3f}"
-            else:
-                # Non-critical metric
-                if '_ms' in metric:
-                    value_str = f"{value:.3f}ms"
-                elif '_us' in metric:
-                    value_str = f"{value:.3f}µs"
-                elif '_w' in metric:
-                    value_str = f"{value:.3f}W"
-                else:
-                    value_str = f"{value:.3f}"
-                threshold_info = ""
-            
-            report.append(f"- {status} **{metric}:** {value_str}{threshold_info}")
-        
-        return "\n".join(report)
+        header = REPORT_HEADER_TEMPLATE.format(
+            sku=sku,
+            platform=results['platform'],
+            timestamp=gate_info.get('timestamp') or datetime.utcnow().isoformat(),
+            decision='✅ PASS' if gate_info['gate_decision'] else '❌ FAIL',
+            critical='✅ PASS' if gate_info['critical_metrics_pass'] else '❌ FAIL',
+            drift=('⏭️ SKIPPED' if gate_info['drift_check_pass'] is None
+                   else '✅ PASS' if gate_info['drift_check_pass'] else '❌ FAIL'),
+            consecutive=gate_info['consecutive_passes'],
+            required=self.consecutive_passes_required,
+            reason=gate_info['reason'],
+        )
+        lines = [self._format_metric_line(metric, value) for metric, value in results['metrics'].items()]
+        return "\n".join((header, *lines))
+
+def check_sku(checker: SloGateChecker, sku: str, results_path: str, sha: str) -> Tuple[bool, str, Dict, str]:
+    """Run the SLO gate for one SKU and return (passed, reason, gate_info, report)"""
+    # Load SLO results
+    results = checker.load_slo_results(results_path)
+    
+    print(f"🔍 Checking SLO gate for {sku} (commit: {sha[:8]})")
+    
+    # Check if gate should pass
+    should_pass, reason, gate_info = checker.should_pass_gate(results, sku)
+    
+    # Record gate result in local history
+    checker._record_gate_result(sku, sha, should_pass, results, gate_info['timestamp'])
+    
+    # Generate report
+    report = checker.generate_report(results, gate_info, sku)
+    return should_pass, reason, gate_info, report
 
 def main():
     parser = argparse.ArgumentParser(description='SLO Gate Checker')
-    parser.add_argument('--results', required=True, help='Path to SLO results JSON file')
-    parser.add_argument('--sku', required=True, help='Reference SKU ID')
+    parser.add_argument('--results', required=True,
+                        help='Path to SLO results JSON file; use {sku} as a placeholder when checking several SKUs')
+    parser.add_argument('--sku', action='append', default=[], help='Reference SKU ID (repeat to check several SKUs)')
+    parser.add_argument('--skus-file', help='File listing reference SKU IDs, one per line')
     parser.add_argument('--github-token', required=True, help='GitHub token for API access')
     parser.add_argument('--repo', required=True, help='GitHub repository (owner/repo)')
     parser.add_argument('--sha', required=True, help='Git commit SHA')
-    parser.add_argument('--output', help='Output file for gate report')
+    parser.add_argument('--output', help='Output file for gate report; use {sku} for one file per SKU')
+    parser.add_argument('--workflow', default='slo-gates.yml', help='Workflow file name or ID that uploads SLO results')
+    parser.add_argument('--branch', help='Only use runs on this branch as history (e.g. the PR base branch)')
     
     args = parser.parse_args()
     
-    # Initialize gate checker
-    checker = SloGateChecker(args.github_token, args.repo)
-    
-    # Load SLO results
-    results = checker.load_slo_results(args.results)
+    skus = list(args.sku)
+    if args.skus_file:
+        with open(args.skus_file, 'r') as f:
+            skus.extend(line.strip() for line in f if line.strip())
+    if not skus:
+        parser.error('at least one --sku or a --skus-file is required')
+    if len(skus) > 1 and '{sku}' not in args.results:
+        parser.error('--results must contain {sku} when checking several SKUs')
     
-    print(f"🔍 Checking SLO gate for {args.sku} (commit: {args.sha[:8]})")
+    # Initialize gate checker; one checker shares its HTTP session and caches across SKUs
+    checker = SloGateChecker(args.github_token, args.repo, args.workflow, args.branch)
     
-    # Check if gate should pass
-    should_pass, reason, gate_info = checker.should_pass_gate(results, args.sku)
+    def run_sku(sku: str):
+        # A SKU whose gate can't be evaluated fails on its own; the other SKUs
+        # have already been recorded in the history, so still report them
+        try:
+            return check_sku(checker, sku, args.results.replace('{sku}', sku), args.sha), None
+        except GateCheckError as e:
+            return None, e
     
-    # Record gate result in local history
-    checker._record_gate_result(args.sku, args.sha, should_pass, results)
-    
-    # Generate report
-    report = checker.generate_report(results, gate_info, args.sku)
+    try:
+        with ThreadPoolExecutor(max_workers=min(checker.max_workers, len(skus))) as executor:
+            outcomes = list(executor.map(run_sku, skus))
+    finally:
+        checker.close()
     
     # Output report
-    if args.output:
+    reports = [(sku, outcome[3]) for sku, (outcome, _) in zip(skus, outcomes) if outcome is not None]
+    if args.output and '{sku}' in args.output:
+        for sku, report in reports:
+            output = args.output.replace('{sku}', sku)
+            with open(output, 'w') as f:
+                f.write(report)
+            print(f"📄 Report written to {output}")
+    elif args.output:
         with open(args.output, 'w') as f:
-            f.write(report)
+            f.write("\n\n".join(report for _, report in reports))
         print(f"📄 Report written to {args.output}")
     else:
-        print("\n" + report)
-    
-    # Print summary
-    print(f"\n{reason}")
-    
-    # Additional information about gate history
-    if gate_info['consecutive_passes'] > 0:
-        print(f"📈 Consecutive passes: {gate_info['consecutive_passes']}/{checker.consecutive_passes_required}")
+        for _, report in reports:
+            print("\n" + report)
     
-    if not gate_info['drift_check_pass'] and gate_info['consecutive_passes'] < checker.consecutive_passes_required:
-        print(f"💡 Tip: Need {checker.consecutive_passes_required - gate_info['consecutive_passes']} more consecutive passes to override drift check")
+    all_passed = True
+    for sku, (outcome, error) in zip(skus, outcomes):
+        if error is not None:
+            print(f"\n❌ {error}")
+            print(f"\n💥 SLO gate FAILED for {sku}")
+            all_passed = False
+            continue
+        
+        # Print summary
+        should_pass, reason, gate_info, _ = outcome
+        print(f"\n{reason}")
+        
+        # Additional information about gate history
+        if gate_info['consecutive_passes'] > 0:
+            print(f"📈 Consecutive passes: {gate_info['consecutive_passes']}/{checker.consecutive_passes_required}")
+        
+        if gate_info['drift_check_pass'] is False and gate_info['consecutive_passes'] < checker.consecutive_passes_required:
+            print(f"💡 Tip: Need {checker.consecutive_passes_required - gate_info['consecutive_passes']} more consecutive passes to override drift check")
+        
+        if should_pass:
+            print(f"\n🎉 SLO gate PASSED for {sku}")
+        else:
+            print(f"\n💥 SLO gate FAILED for {sku}")
+            all_passed = False
     
     # Set exit code
-    if should_pass:
-        print(f"\n🎉 SLO gate PASSED for {args.sku}")
-        sys.exit(0)
-    else:
-        print(f"\n💥 SLO gate FAILED for {args.sku}")
-        sys.exit(1)
+    sys.exit(0 if all_passed else 1)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file